@@ -0,0 +1,211 @@
+"""Benchmark shared HTTP connection pools against per-request clients using a local stub server."""
+
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import cast
+
+import httpx
+import requests
+from rich.console import Console
+from rich.table import Table
+
+from tweet_analysis_agent.http_clients import build_llm_http_client, build_x_session
+
+console = Console()
+
+STUB_COMPLETION = {
+    "id": "chatcmpl-stub",
+    "object": "chat.completion",
+    "model": "stub",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+}
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded HTTP/1.1 server that counts accepted TCP connections."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], latency_ms: float):
+        super().__init__(address, StubHandler)
+        self.latency_ms = latency_ms
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        """Count each new connection before handing it to a worker thread."""
+        with self._lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Respond to every request with a canned chat completion, keeping the connection alive."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes, which Nagle would hold back for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def _respond(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        if length:
+            self.rfile.read(length)
+        time.sleep(cast(StubServer, self.server).latency_ms / 1000)
+        body = json.dumps(STUB_COMPLETION).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):  # noqa: A002
+        """Silence per-request logging."""
+
+
+async def run_llm_scenario(url: str, requests_total: int, concurrency: int, shared: bool, config: dict) -> list[float]:
+    """Send chat requests with httpx, either through one shared pool or a new client per request."""
+    semaphore = asyncio.Semaphore(concurrency)
+    shared_client = build_llm_http_client(config) if shared else None
+    latencies: list[float] = []
+
+    async def send_one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            if shared_client is not None:
+                response = await shared_client.post(url, json={"model": "stub"})
+            else:
+                async with httpx.AsyncClient() as client:
+                    response = await client.post(url, json={"model": "stub"})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    try:
+        await asyncio.gather(*(send_one() for _ in range(requests_total)))
+    finally:
+        if shared_client is not None:
+            await shared_client.aclose()
+    return latencies
+
+
+def run_x_scenario(url: str, requests_total: int, concurrency: int, shared: bool, config: dict) -> list[float]:
+    """Send X-style requests with requests, either through one shared session or a new session per request."""
+    shared_session = build_x_session(config) if shared else None
+
+    def send_one(_: int) -> float:
+        started = time.perf_counter()
+        if shared_session is not None:
+            response = shared_session.get(url, timeout=30)
+        else:
+            with requests.Session() as session:
+                response = session.get(url, timeout=30)
+        response.raise_for_status()
+        return time.perf_counter() - started
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(send_one, range(requests_total)))
+    finally:
+        if shared_session is not None:
+            shared_session.close()
+
+
+def summarize(name: str, latencies: list[float], elapsed: float, connections: int) -> dict:
+    """Build one result row for a scenario."""
+    ordered = sorted(latencies)
+    return {
+        "scenario": name,
+        "requests": len(latencies),
+        "connections": connections,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.mean(ordered) * 1000,
+        "p95_ms": ordered[int(len(ordered) * 0.95) - 1] * 1000 if ordered else 0.0,
+    }
+
+
+def main():
+    """Run the connection pool benchmark against a local stub server and print the results."""
+    parser = argparse.ArgumentParser(
+        description="Compare shared HTTP pools with per-request clients against a local stub server",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent requests in flight")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Simulated server processing time")
+    parser.add_argument(
+        "--max-connections-per-host",
+        type=int,
+        default=20,
+        help="Maximum connections per host, extra requests wait for a free one",
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON instead of a table")
+    args = parser.parse_args()
+
+    config = {"max_connections_per_host": args.max_connections_per_host}
+    server = StubServer(("127.0.0.1", 0), args.latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    llm_url = f"{base_url}/v1/chat/completions"
+    x_url = f"{base_url}/2/tweets/search/recent"
+    scenarios = [
+        (
+            "llm: client per request",
+            lambda: asyncio.run(run_llm_scenario(llm_url, args.requests, args.concurrency, False, config)),
+        ),
+        (
+            "llm: shared pool",
+            lambda: asyncio.run(run_llm_scenario(llm_url, args.requests, args.concurrency, True, config)),
+        ),
+        ("x: session per request", lambda: run_x_scenario(x_url, args.requests, args.concurrency, False, config)),
+        ("x: shared session", lambda: run_x_scenario(x_url, args.requests, args.concurrency, True, config)),
+    ]
+
+    results = []
+    try:
+        for name, run in scenarios:
+            connections_before = server.connections
+            started = time.perf_counter()
+            latencies = run()
+            elapsed = time.perf_counter() - started
+            results.append(summarize(name, latencies, elapsed, server.connections - connections_before))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    if args.json:
+        console.print_json(json.dumps(results))
+        return
+
+    table = Table(title="HTTP connection pool benchmark")
+    table.add_column("Scenario")
+    table.add_column("Requests", justify="right")
+    table.add_column("Connections", justify="right")
+    table.add_column("Req/s", justify="right")
+    table.add_column("Mean ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    for row in results:
+        table.add_row(
+            row["scenario"],
+            str(row["requests"]),
+            str(row["connections"]),
+            f"{row['throughput_rps']:.1f}",
+            f"{row['mean_ms']:.1f}",
+            f"{row['p95_ms']:.1f}",
+        )
+    console.print(table)
+    console.print(
+        "[dim]Each connection costs a TCP handshake, plus a TLS handshake against real HTTPS endpoints.[/dim]"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+"""Load-test the bindufied agent server end to end with stubbed model and X/Twitter backends."""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import cast
+
+import httpx
+from requests.adapters import HTTPAdapter
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+DEFAULT_QUERIES = [
+    "Analyze sentiment around our brand on X for the past 10 tweets",
+    "Monitor competitor mentions and compare sentiment vs our brand",
+    "Generate a brand health report from recent social media activity",
+    "Identify trending topics and user sentiment about our product",
+    "Create a social media intelligence report for executive review",
+]
+
+DEFAULT_STAGES = [{"name": f"c{level}", "concurrency": level, "requests": 4 * level} for level in (1, 2, 4, 8, 16)]
+
+TERMINAL_STATES = {"completed", "failed", "canceled", "rejected"}
+
+X_API_HOST = "https://api.twitter.com"
+
+
+class StubBackendServer(ThreadingHTTPServer):
+    """Threaded server standing in for the OpenAI chat API and the X/Twitter search API."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], llm_latency_ms: float, x_latency_ms: float):
+        super().__init__(address, StubBackendHandler)
+        self.llm_latency_ms = llm_latency_ms
+        self.x_latency_ms = x_latency_ms
+
+
+class StubBackendHandler(BaseHTTPRequestHandler):
+    """Answer chat completions with a search tool call, then a report, and searches with canned tweets."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes, which Nagle would hold back for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def _send_json(self, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        """Serve /chat/completions: a search_posts tool call first, the final report once tool output is present."""
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(cast(StubBackendServer, self.server).llm_latency_ms / 1000)
+
+        messages = request.get("messages", [])
+        if any(message.get("role") == "tool" for message in messages):
+            message = {"role": "assistant", "content": "# Social Media Intelligence Report 📊\n\nStubbed report."}
+            finish_reason = "stop"
+        else:
+            query = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "brand")
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": f"call_{uuid.uuid4().hex[:12]}",
+                        "type": "function",
+                        "function": {
+                            "name": "search_posts",
+                            "arguments": json.dumps({"query": str(query)[:64], "max_results": 10}),
+                        },
+                    }
+                ],
+            }
+            finish_reason = "tool_calls"
+
+        self._send_json({
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+        })
+
+    def do_GET(self):
+        """Serve /2/tweets/search/recent with ten canned tweets."""
+        time.sleep(cast(StubBackendServer, self.server).x_latency_ms / 1000)
+        tweets = [
+            {
+                "id": str(1000 + index),
+                "author_id": "42",
+                "text": f"Stub tweet {index} about the brand",
+                "created_at": "2026-01-01T00:00:00.000Z",
+                "edit_history_tweet_ids": [str(1000 + index)],
+                "public_metrics": {
+                    "retweet_count": index,
+                    "reply_count": 1,
+                    "like_count": 10 * index,
+                    "quote_count": 0,
+                },
+            }
+            for index in range(10)
+        ]
+        self._send_json({
+            "data": tweets,
+            "includes": {"users": [{"id": "42", "name": "Stub User", "username": "stub_user", "verified": False}]},
+            "meta": {"result_count": len(tweets)},
+        })
+
+    def log_message(self, format, *args):  # noqa: A002
+        """Silence per-request logging."""
+
+
+class XStubAdapter(HTTPAdapter):
+    """Redirect tweepy's requests from the X/Twitter API host to the local stub backend."""
+
+    def __init__(self, stub_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.stub_url = stub_url
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """Rewrite the request URL to the stub backend before sending."""
+        request.url = self.stub_url + request.url[len(X_API_HOST) :]
+        return super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+
+def serve_stubbed_agent(port: int, llm_latency_ms: float, x_latency_ms: float) -> None:
+    """Run the real agent server with its model and X/Twitter backends pointed at a local stub."""
+    stub = StubBackendServer(("127.0.0.1", 0), llm_latency_ms, x_latency_ms)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    stub_url = f"http://127.0.0.1:{stub.server_address[1]}"
+
+    # Credentials only need to be present, the stub accepts anything
+    os.environ.update({
+        "OPENAI_API_KEY": "stub",
+        "OPENAI_BASE_URL": f"{stub_url}/v1",
+        "X_CONSUMER_KEY": "stub",
+        "X_CONSUMER_SECRET": "stub",
+        "X_ACCESS_TOKEN": "stub",
+        "X_ACCESS_TOKEN_SECRET": "stub",
+        "X_BEARER_TOKEN": "stub",
+    })
+
+    from tweet_analysis_agent.http_clients import configure_http_clients, get_x_session, x_adapter_options
+    from tweet_analysis_agent.main import load_config, run_agent_server
+
+    config = load_config()
+    config["deployment"] = {**config.get("deployment", {}), "url": f"http://127.0.0.1:{port}"}
+    config["watchlist"] = {"enabled": False}
+
+    # Build the X session from the production pool settings before redirecting it to the stub
+    configure_http_clients(config.get("http", {}))
+    get_x_session().mount(X_API_HOST, XStubAdapter(stub_url, **x_adapter_options()))
+    run_agent_server(config)
+
+
+def load_stages(path: str | None) -> list[dict]:
+    """Load load-test stages from a JSONL file, one stage per line."""
+    if not path:
+        return DEFAULT_STAGES
+
+    stages = []
+    for line_number, line in enumerate(Path(path).read_text().splitlines(), start=1):
+        if not line.strip():
+            continue
+        stage = json.loads(line)
+        if "concurrency" not in stage or ("requests" not in stage and "duration_seconds" not in stage):
+            console.print(
+                f"[red]Error:[/red] {path}:{line_number} needs 'concurrency' and 'requests' or 'duration_seconds'"
+            )
+            sys.exit(1)
+        stage.setdefault("name", f"stage-{line_number}")
+        stages.append(stage)
+    return stages
+
+
+async def send_analysis(client: httpx.AsyncClient, url: str, query: str, timeout: float, poll_interval: float) -> str:
+    """Submit one analysis over JSON-RPC and poll until the task finishes, returning its final state."""
+    task_id = str(uuid.uuid4())
+    payload = {
+        "jsonrpc": "2.0",
+        "method": "message/send",
+        "params": {
+            "message": {
+                "role": "user",
+                "parts": [{"kind": "text", "text": query}],
+                "kind": "message",
+                "messageId": str(uuid.uuid4()),
+                "contextId": str(uuid.uuid4()),
+                "taskId": task_id,
+            },
+            "configuration": {"acceptedOutputModes": ["application/json"]},
+        },
+        "id": str(uuid.uuid4()),
+    }
+    deadline = time.perf_counter() + timeout
+    response = await client.post(url, json=payload)
+    response.raise_for_status()
+    body = response.json()
+    if "error" in body:
+        return f"rpc-error: {body['error'].get('message', body['error'])}"
+
+    task = body.get("result", {})
+    task_id = task.get("id", task_id)
+    while task.get("status", {}).get("state") not in TERMINAL_STATES:
+        if time.perf_counter() > deadline:
+            return "timeout"
+        await asyncio.sleep(poll_interval)
+        response = await client.post(
+            url, json={"jsonrpc": "2.0", "method": "tasks/get", "params": {"taskId": task_id}, "id": str(uuid.uuid4())}
+        )
+        response.raise_for_status()
+        body = response.json()
+        if "error" in body:
+            return f"rpc-error: {body['error'].get('message', body['error'])}"
+        task = body.get("result", {})
+    return task["status"]["state"]
+
+
+async def run_stage(client: httpx.AsyncClient, url: str, stage: dict, args: argparse.Namespace) -> dict:
+    """Drive one stage at its concurrency, ramping workers up linearly, and summarize the results."""
+    concurrency = int(stage["concurrency"])
+    ramp_up = float(stage.get("ramp_up_seconds", 0))
+    max_requests = stage.get("requests")
+    duration = stage.get("duration_seconds")
+    queries = stage.get("queries") or DEFAULT_QUERIES
+
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+    issued = 0
+    started = time.perf_counter()
+
+    def has_budget() -> bool:
+        if max_requests is not None and issued >= max_requests:
+            return False
+        return duration is None or time.perf_counter() - started < duration
+
+    async def worker(index: int) -> None:
+        nonlocal issued
+        await asyncio.sleep(ramp_up * index / concurrency)
+        while has_budget():
+            issued += 1
+            query = random.choice(queries)  # noqa: S311
+            if not args.allow_coalescing:
+                # Identical concurrent queries are coalesced by the agent, so make each one unique
+                query = f"{query} (load test {uuid.uuid4().hex[:8]})"
+            request_started = time.perf_counter()
+            try:
+                state = await send_analysis(client, url, query, args.timeout, args.poll_interval)
+            except httpx.HTTPError as e:
+                state = f"http-error: {type(e).__name__}"
+            if state == "completed":
+                latencies.append(time.perf_counter() - request_started)
+            else:
+                errors[state] = errors.get(state, 0) + 1
+
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    def percentile(fraction: float) -> float:
+        if not latencies:
+            return 0.0
+        ordered = sorted(latencies)
+        return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] * 1000
+
+    total = len(latencies) + sum(errors.values())
+    return {
+        "stage": stage["name"],
+        "concurrency": concurrency,
+        "requests": total,
+        "succeeded": len(latencies),
+        "errors": errors,
+        "error_rate": sum(errors.values()) / total if total else 0.0,
+        "elapsed_seconds": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.mean(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+    }
+
+
+def wait_for_server(url: str, timeout: float, process: subprocess.Popen | None = None) -> bool:
+    """Wait until the agent server accepts HTTP connections."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            return False
+        try:
+            httpx.get(url, timeout=2)
+        except httpx.HTTPError:
+            time.sleep(0.5)
+        else:
+            return True
+    return False
+
+
+def print_report(results: list[dict]) -> None:
+    """Print the per-stage latency, throughput and error report and the saturation curve."""
+    table = Table(title="Load test results")
+    for column in ("Stage", "Concurrency", "Requests", "Errors", "Req/s", "p50 ms", "p95 ms", "p99 ms"):
+        table.add_column(column, justify="left" if column == "Stage" else "right")
+    for row in results:
+        table.add_row(
+            row["stage"],
+            str(row["concurrency"]),
+            str(row["requests"]),
+            f"{row['error_rate']:.1%}",
+            f"{row['throughput_rps']:.2f}",
+            f"{row['p50_ms']:.0f}",
+            f"{row['p95_ms']:.0f}",
+            f"{row['p99_ms']:.0f}",
+        )
+    console.print(table)
+
+    for row in results:
+        for state, count in row["errors"].items():
+            console.print(f"[yellow]{row['stage']}:[/yellow] {count} x {state}")
+
+    # Throughput by concurrency: the curve flattens where the server saturates
+    peak = max((row["throughput_rps"] for row in results), default=0.0)
+    console.print("\n[bold]Saturation curve[/bold] (throughput by concurrency)")
+    for row in sorted(results, key=lambda r: r["concurrency"]):
+        bar = "█" * round(40 * row["throughput_rps"] / peak) if peak else ""
+        console.print(f"{row['concurrency']:>5} │ {bar} {row['throughput_rps']:.2f} req/s, p95 {row['p95_ms']:.0f} ms")
+
+
+async def run_load_test(url: str, stages: list[dict], args: argparse.Namespace) -> list[dict]:
+    """Run every stage in order against the server."""
+    limits = httpx.Limits(max_connections=max(int(stage["concurrency"]) for stage in stages) + 10)
+    results = []
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        for stage in stages:
+            with console.status(f"[bold green]Running stage {stage['name']} (concurrency {stage['concurrency']})..."):
+                results.append(await run_stage(client, url, stage, args))
+    return results
+
+
+def main():
+    """Start a stubbed agent server (or target a running one), drive it with load stages and report."""
+    parser = argparse.ArgumentParser(
+        description="Load-test the Tweet Analysis Agent server with stubbed model and X/Twitter backends",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            "Stages file (JSONL), one stage per line:\n"
+            '  {"name": "warmup", "concurrency": 1, "requests": 5}\n'
+            '  {"name": "ramp", "concurrency": 8, "ramp_up_seconds": 10, "duration_seconds": 60}\n'
+            'Optional per-stage "queries": ["..."] overrides the built-in sample queries.'
+        ),
+    )
+    parser.add_argument("--stages", help="JSONL file with load stages (default: concurrency 1, 2, 4, 8, 16)")
+    parser.add_argument("--url", help="Target an already running server instead of starting a stubbed one")
+    parser.add_argument("--port", type=int, default=3799, help="Port for the stubbed agent server")
+    parser.add_argument("--llm-latency-ms", type=float, default=1000.0, help="Simulated latency per LLM completion")
+    parser.add_argument("--x-latency-ms", type=float, default=300.0, help="Simulated latency per X/Twitter search")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="Seconds between task status polls")
+    parser.add_argument(
+        "--allow-coalescing", action="store_true", help="Send queries verbatim so identical ones may be coalesced"
+    )
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    parser.add_argument("--server-log", help="File for the stubbed server's output (default: a file in the temp dir)")
+    parser.add_argument("--serve-stub", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_stub:
+        serve_stubbed_agent(args.port, args.llm_latency_ms, args.x_latency_ms)
+        return
+
+    stages = load_stages(args.stages)
+    server = None
+    server_log = None
+    server_log_path = None
+    url = args.url
+    if not url:
+        url = f"http://127.0.0.1:{args.port}/"
+        command = [
+            sys.executable,
+            __file__,
+            "--serve-stub",
+            f"--port={args.port}",
+            f"--llm-latency-ms={args.llm_latency_ms}",
+            f"--x-latency-ms={args.x_latency_ms}",
+        ]
+        server_log_path = Path(
+            args.server_log or Path(tempfile.gettempdir()) / f"tweet-analysis-load-test-{args.port}.log"
+        )
+        server_log = server_log_path.open("w")
+        server = subprocess.Popen(command, stdout=server_log, stderr=subprocess.STDOUT)  # noqa: S603
+
+    try:
+        with console.status("[bold green]Waiting for agent server..."):
+            ready = wait_for_server(url, timeout=60, process=server)
+        if not ready:
+            console.print(f"[red]Error:[/red] Agent server did not start at {url}")
+            if server_log is not None and server_log_path is not None:
+                server_log.flush()
+                tail = server_log_path.read_text(errors="replace").splitlines()[-20:]
+                console.print("\n".join(tail), markup=False, highlight=False)
+                console.print(f"[yellow]Server log:[/yellow] {server_log_path}")
+            sys.exit(1)
+
+        results = asyncio.run(run_load_test(url, stages, args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+        if server_log is not None:
+            server_log.close()
+
+    print_report(results)
+    if server_log_path is not None:
+        console.print(f"\n[dim]Server log: {server_log_path}[/dim]")
+    if args.output:
+        Path(args.output).write_text(json.dumps({"url": url, "stages": results}, indent=2))
+        console.print(f"\n[green]✓ Report written to {args.output}[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Tests for the shared HTTP connection pools."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import httpx
+import pytest
+from requests.adapters import HTTPAdapter
+
+from tweet_analysis_agent.http_clients import (
+    build_llm_http_client,
+    build_x_session,
+    close_http_clients,
+    configure_http_clients,
+    get_http_pool_stats,
+    get_llm_http_client,
+    get_x_session,
+)
+
+
+@pytest.fixture(autouse=True)
+async def reset_http_clients():
+    """Start and finish every test without shared clients."""
+    await close_http_clients()
+    configure_http_clients()
+    yield
+    await close_http_clients()
+    configure_http_clients()
+
+
+@pytest.mark.asyncio
+async def test_shared_clients_are_reused():
+    """Test that repeated lookups return the same pooled clients."""
+    assert get_llm_http_client() is get_llm_http_client()
+    assert get_x_session() is get_x_session()
+
+
+@pytest.mark.asyncio
+async def test_configure_http_clients_applies_pool_limits():
+    """Test that configured limits reach the LLM client and X session pools."""
+    configure_http_clients({"max_connections_per_host": 7, "http2": True})
+
+    with patch("tweet_analysis_agent.http_clients.httpx.AsyncClient") as mock_client:
+        build_llm_http_client()
+
+    kwargs = mock_client.call_args.kwargs
+    assert kwargs["limits"] == httpx.Limits(max_connections=7, max_keepalive_connections=7, keepalive_expiry=30.0)
+    assert kwargs["http2"] is True
+
+    adapter = get_x_session().get_adapter("https://api.x.com")
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_maxsize == 7
+    assert adapter._pool_block is True
+
+
+def start_counting_server(connections: list) -> ThreadingHTTPServer:
+    """Start a slow local HTTP/1.1 server that records every accepted connection."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            connections.append(self.client_address)
+            super().setup()
+
+        def do_GET(self):
+            time.sleep(0.05)
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, format, *args):  # noqa: A002
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_x_session_does_not_open_more_than_per_host_limit():
+    """Test that concurrent X requests wait for a pooled connection instead of opening extra ones."""
+    connections = []
+    server = start_counting_server(connections)
+    url = f"http://127.0.0.1:{server.server_address[1]}/2/tweets/search/recent"
+    session = build_x_session({"max_connections_per_host": 2})
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            statuses = list(executor.map(lambda _: session.get(url, timeout=10).status_code, range(8)))
+    finally:
+        session.close()
+        server.shutdown()
+        server.server_close()
+
+    assert statuses == [200] * 8
+    assert len(connections) <= 2
+
+
+@pytest.mark.asyncio
+async def test_llm_client_does_not_open_more_than_per_host_limit():
+    """Test that concurrent LLM requests queue on the per-host cap instead of opening extra connections."""
+    connections = []
+    server = start_counting_server(connections)
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    client = build_llm_http_client({"max_connections_per_host": 2})
+
+    try:
+        responses = await asyncio.gather(*(client.get(url) for _ in range(8)))
+    finally:
+        await client.aclose()
+        server.shutdown()
+        server.server_close()
+
+    assert [response.status_code for response in responses] == [200] * 8
+    assert len(connections) <= 2
+
+
+@pytest.mark.asyncio
+async def test_close_http_clients_creates_fresh_clients():
+    """Test that closing releases the shared clients so new ones are built."""
+    client = get_llm_http_client()
+    session = get_x_session()
+
+    await close_http_clients()
+
+    assert client.is_closed
+    assert get_llm_http_client() is not client
+    assert get_x_session() is not session
+
+
+def test_http_pool_stats_count_x_requests():
+    """Test that X session pool metrics report requests and reused connections."""
+    session = build_x_session()
+    adapter = session.get_adapter("https://api.x.com")
+    assert isinstance(adapter, HTTPAdapter)
+    pool = adapter.poolmanager.connection_from_url("https://api.x.com")
+    pool.num_requests = 5
+    pool.num_connections = 2
+
+    with patch("tweet_analysis_agent.http_clients._x_session", session):
+        stats = get_http_pool_stats()
+
+    assert stats["x"] == {"requests": 5, "connections_opened": 2, "hosts": 1, "reused_connections": 3}
+    assert set(stats["llm"]) == {"requests", "connections_opened", "tls_handshakes", "reused_connections"}
@@ -1,10 +1,28 @@
 """Tests for the Tweet Analysis Agent."""
 
+import asyncio
+import gc
+import importlib
+import json
+import time
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from tweet_analysis_agent.main import handler
+from tweet_analysis_agent.main import (
+    _inflight_runs,
+    _precomputed_reports,
+    get_coalesced_request_count,
+    handler,
+    normalize_query,
+    precompute_watchlist,
+    start_scheduler,
+    stop_scheduler,
+    watchlist_key,
+)
+
+agent_main = importlib.import_module("tweet_analysis_agent.main")
 
 
 @pytest.mark.asyncio
@@ -201,3 +219,379 @@ async def test_handler_with_brand_monitoring_query():
         "our_brand": {"mentions": 150, "sentiment": 0.8},
         "competitor_xyz": {"mentions": 200, "sentiment": 0.65},
     }
+
+
+def test_normalize_query_ignores_case_and_whitespace():
+    """Test that queries differing only in case and whitespace share a key."""
+    first = [{"role": "user", "content": "Analyze  sentiment for @OurBrand"}]
+    second = [{"role": "User", "content": " analyze sentiment for @ourbrand\n"}]
+    other = [{"role": "user", "content": "Analyze sentiment for @competitor"}]
+
+    assert normalize_query(first) == normalize_query(second)
+    assert normalize_query(first) != normalize_query(other)
+
+
+@pytest.mark.asyncio
+async def test_handler_coalesces_concurrent_identical_queries():
+    """Test that concurrent identical queries share a single agent run."""
+    messages = [{"role": "user", "content": "Generate a brand health report for @ourbrand"}]
+
+    mock_response = MagicMock()
+    mock_response.run_id = "coalesced-run-id"
+    release = asyncio.Event()
+
+    async def slow_run(_messages):
+        await release.wait()
+        return mock_response
+
+    with (
+        patch("tweet_analysis_agent.main._initialized", True),
+        patch("tweet_analysis_agent.main._coalesced_requests", 0),
+        patch.dict("tweet_analysis_agent.main._inflight_runs", clear=True),
+        patch("tweet_analysis_agent.main.run_agent", side_effect=slow_run) as mock_run,
+    ):
+        calls = [asyncio.create_task(handler(messages)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*calls)
+
+        mock_run.assert_called_once_with(messages)
+        assert all(result is mock_response for result in results)
+        assert get_coalesced_request_count() == 4
+        assert _inflight_runs == {}
+
+
+@pytest.mark.asyncio
+async def test_handler_coalesced_requests_share_errors():
+    """Test that a failed run is reported to every coalesced caller."""
+    messages = [{"role": "user", "content": "Monitor mentions of @ourbrand"}]
+    release = asyncio.Event()
+
+    async def failing_run(_messages):
+        await release.wait()
+        error_msg = "X API unavailable"
+        raise RuntimeError(error_msg)
+
+    with (
+        patch("tweet_analysis_agent.main._initialized", True),
+        patch("tweet_analysis_agent.main._coalesced_requests", 0),
+        patch.dict("tweet_analysis_agent.main._inflight_runs", clear=True),
+        patch("tweet_analysis_agent.main.run_agent", side_effect=failing_run) as mock_run,
+    ):
+        calls = [asyncio.create_task(handler(messages)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+        mock_run.assert_called_once()
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert _inflight_runs == {}
+
+
+@pytest.mark.asyncio
+async def test_handler_failed_run_after_all_callers_cancelled_is_retrieved():
+    """Test that a run failing after every caller was cancelled does not leave an unretrieved exception."""
+    messages = [{"role": "user", "content": "Monitor mentions of @ourbrand"}]
+    release = asyncio.Event()
+    unhandled = []
+
+    async def failing_run(_messages):
+        await release.wait()
+        error_msg = "X API unavailable"
+        raise RuntimeError(error_msg)
+
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda _loop, context: unhandled.append(context))
+    try:
+        with (
+            patch("tweet_analysis_agent.main._initialized", True),
+            patch.dict("tweet_analysis_agent.main._inflight_runs", clear=True),
+            patch("tweet_analysis_agent.main.run_agent", side_effect=failing_run),
+        ):
+            call = asyncio.create_task(handler(messages))
+            await asyncio.sleep(0)
+            run = next(iter(_inflight_runs.values()))
+            call.cancel()
+            release.set()
+            await asyncio.gather(call, return_exceptions=True)
+            while not run.done():
+                await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            del run
+            gc.collect()
+    finally:
+        loop.set_exception_handler(None)
+
+    assert unhandled == []
+
+
+@pytest.mark.asyncio
+async def test_handler_serves_precomputed_report():
+    """Test that handler serves a warm watch-list report with staleness details in its content."""
+    messages = [{"role": "user", "content": "Analyze sentiment around Agno on X"}]
+
+    mock_response = MagicMock()
+    mock_response.content = "Pre-built Agno report"
+    mock_response.metadata = {"tweets_analyzed": 10}
+
+    with (
+        patch("tweet_analysis_agent.main._initialized", True),
+        patch("tweet_analysis_agent.main._watchlist_system_messages", []),
+        patch("tweet_analysis_agent.main._watchlist_interval_seconds", 900.0),
+        patch("tweet_analysis_agent.main._watchlist_max_age_seconds", 3600.0),
+        patch.dict(
+            "tweet_analysis_agent.main._precomputed_reports",
+            {watchlist_key(messages): {"response": mock_response, "generated_at": time.time() - 1200}},
+            clear=True,
+        ),
+        patch("tweet_analysis_agent.main.run_agent", new_callable=AsyncMock) as mock_run,
+    ):
+        result = await handler(messages)
+
+    mock_run.assert_not_called()
+    # bindu forwards only the content of a run, so the staleness details must be part of it
+    report, footer = result.content.split("\n\n---\n⏱️ Pre-computed report: ")
+    assert report == "Pre-built Agno report"
+    staleness = json.loads(footer)
+    assert staleness["precomputed"] is True
+    assert staleness["age_seconds"] >= 1200
+    assert staleness["refresh_interval_seconds"] == 900.0
+    assert staleness["stale"] is True
+    assert result.metadata["tweets_analyzed"] == 10
+    assert result.metadata["stale"] is True
+    assert mock_response.content == "Pre-built Agno report"
+    assert mock_response.metadata == {"tweets_analyzed": 10}
+
+
+@pytest.mark.asyncio
+async def test_handler_serves_precomputed_report_behind_system_prompt():
+    """Test that reports built with the system prompts bindu sends are served to matching requests."""
+    system_message = {"role": "system", "content": "Respond with a structured JSON object."}
+    query = "Analyze sentiment around Agno on X"
+    messages = [system_message, {"role": "user", "content": f"  {query.upper()} "}]
+
+    scheduler_agent = MagicMock()
+    scheduler_agent.arun = AsyncMock(return_value=MagicMock(content="Warm Agno report", metadata=None))
+    on_demand_response = MagicMock(content="On-demand Agno report")
+
+    with (
+        patch("tweet_analysis_agent.main._initialized", True),
+        patch("tweet_analysis_agent.main._watchlist_system_messages", []),
+        patch("tweet_analysis_agent.main._scheduler_wake") as mock_wake,
+        patch("tweet_analysis_agent.main._watchlist_max_age_seconds", 3600.0),
+        patch.dict("tweet_analysis_agent.main._precomputed_reports", clear=True),
+        patch(
+            "tweet_analysis_agent.main.run_agent",
+            new_callable=AsyncMock,
+            return_value=on_demand_response,
+        ) as mock_run,
+    ):
+        # The first request runs on demand and teaches the scheduler bindu's system prompt
+        first = await handler(messages)
+        mock_wake.set.assert_called_once()
+
+        await precompute_watchlist(scheduler_agent, [{"brand": "Agno", "query": query}])
+        second = await handler(messages)
+
+    scheduler_agent.arun.assert_awaited_once_with([system_message, {"role": "user", "content": query}])
+    mock_run.assert_awaited_once_with(messages)
+    assert first is on_demand_response
+    assert second.content.startswith("Warm Agno report\n\n---\n⏱️ Pre-computed report: ")
+    assert '"stale": false' in second.content
+
+
+@pytest.mark.asyncio
+async def test_handler_skips_precomputed_report_with_other_system_prompt():
+    """Test that a report built without the request's system prompt is not served."""
+    query = "Analyze sentiment around Agno on X"
+    plain_messages = [{"role": "user", "content": query}]
+    messages = [{"role": "system", "content": "Respond with a structured JSON object."}, *plain_messages]
+    fresh_response = MagicMock(content="Fresh Agno report")
+
+    with (
+        patch("tweet_analysis_agent.main._initialized", True),
+        patch("tweet_analysis_agent.main._watchlist_system_messages", []),
+        patch("tweet_analysis_agent.main._scheduler_wake"),
+        patch("tweet_analysis_agent.main._watchlist_max_age_seconds", 3600.0),
+        patch.dict(
+            "tweet_analysis_agent.main._precomputed_reports",
+            {watchlist_key(plain_messages): {"response": MagicMock(), "generated_at": time.time()}},
+            clear=True,
+        ),
+        patch(
+            "tweet_analysis_agent.main.run_agent",
+            new_callable=AsyncMock,
+            return_value=fresh_response,
+        ) as mock_run,
+    ):
+        result = await handler(messages)
+
+    mock_run.assert_awaited_once_with(messages)
+    assert result is fresh_response
+
+
+@pytest.mark.asyncio
+async def test_handler_ignores_expired_precomputed_report():
+    """Test that handler runs the agent when the watch-list report is too old."""
+    messages = [{"role": "user", "content": "Analyze sentiment around Agno on X"}]
+
+    stale_response = MagicMock()
+    fresh_response = MagicMock()
+    fresh_response.content = "Fresh Agno report"
+
+    with (
+        patch("tweet_analysis_agent.main._initialized", True),
+        patch("tweet_analysis_agent.main._watchlist_system_messages", []),
+        patch("tweet_analysis_agent.main._watchlist_max_age_seconds", 3600.0),
+        patch.dict(
+            "tweet_analysis_agent.main._precomputed_reports",
+            {watchlist_key(messages): {"response": stale_response, "generated_at": time.time() - 7200}},
+            clear=True,
+        ),
+        patch(
+            "tweet_analysis_agent.main.run_agent",
+            new_callable=AsyncMock,
+            return_value=fresh_response,
+        ) as mock_run,
+    ):
+        result = await handler(messages)
+
+    mock_run.assert_called_once_with(messages)
+    assert result.content == "Fresh Agno report"
+
+
+@pytest.mark.asyncio
+async def test_precompute_watchlist_stores_reports():
+    """Test that pre-computation stores a report per watched query and skips failures."""
+    mock_agent = MagicMock()
+    mock_agent.arun = AsyncMock(side_effect=[MagicMock(content="Agno report"), RuntimeError("rate limited")])
+    queries = [
+        {"brand": "Agno", "query": "Analyze sentiment around Agno on X"},
+        {"brand": "Other", "query": "Analyze sentiment around Other on X"},
+    ]
+
+    system_messages = [{"role": "system", "content": "Respond with a structured JSON object."}]
+
+    with (
+        patch("tweet_analysis_agent.main._watchlist_system_messages", system_messages),
+        patch.dict("tweet_analysis_agent.main._precomputed_reports", clear=True),
+    ):
+        await precompute_watchlist(mock_agent, queries)
+
+        messages = [*system_messages, {"role": "user", "content": "Analyze sentiment around Agno on X"}]
+        key = watchlist_key(messages)
+        assert list(_precomputed_reports) == [key]
+        assert _precomputed_reports[key]["response"].content == "Agno report"
+        assert mock_agent.arun.call_count == 2
+        mock_agent.arun.assert_any_await(messages)
+
+
+WATCHLIST: dict[str, Any] = {
+    "enabled": True,
+    "interval_seconds": 60,
+    "max_age_seconds": 300,
+    "queries": [{"brand": "Agno", "query": "Analyze sentiment around Agno on X"}],
+}
+
+
+@pytest.mark.parametrize(
+    "watchlist",
+    [
+        {},
+        {**WATCHLIST, "enabled": False},
+        {**WATCHLIST, "queries": []},
+    ],
+)
+def test_start_scheduler_skips_disabled_or_empty_watchlist(watchlist):
+    """Test that no agent or thread is created unless the watch-list is enabled and has queries."""
+    with (
+        patch("tweet_analysis_agent.main.create_agent") as mock_create,
+        patch("tweet_analysis_agent.main.threading.Thread") as mock_thread,
+    ):
+        start_scheduler(watchlist)
+
+    mock_create.assert_not_called()
+    mock_thread.assert_not_called()
+
+
+def test_start_scheduler_disabled_when_credentials_missing():
+    """Test that the scheduler is not started when the agent cannot be created."""
+    with (
+        patch("tweet_analysis_agent.main._watchlist_interval_seconds", 900.0),
+        patch("tweet_analysis_agent.main._watchlist_max_age_seconds", 3600.0),
+        patch("tweet_analysis_agent.main.build_llm_http_client"),
+        patch("tweet_analysis_agent.main.create_agent", side_effect=ValueError("No API key provided")),
+        patch("tweet_analysis_agent.main.threading.Thread") as mock_thread,
+        patch("tweet_analysis_agent.main._scheduler_thread", None),
+    ):
+        start_scheduler(WATCHLIST)
+
+        mock_thread.assert_not_called()
+        assert agent_main._scheduler_thread is None
+
+
+def test_start_scheduler_applies_config_and_starts_thread():
+    """Test that the cadence comes from config and the scheduler runs on a daemon thread."""
+    mock_agent = MagicMock()
+
+    with (
+        patch("tweet_analysis_agent.main._watchlist_interval_seconds", 900.0),
+        patch("tweet_analysis_agent.main._watchlist_max_age_seconds", 3600.0),
+        patch("tweet_analysis_agent.main._scheduler_thread", None),
+        patch("tweet_analysis_agent.main.build_llm_http_client") as mock_build_client,
+        patch("tweet_analysis_agent.main.create_agent", return_value=mock_agent) as mock_create,
+        patch("tweet_analysis_agent.main.threading.Thread") as mock_thread,
+    ):
+        start_scheduler(WATCHLIST)
+
+        assert agent_main._watchlist_interval_seconds == 60.0
+        assert agent_main._watchlist_max_age_seconds == 300.0
+        # The scheduler runs on its own event loop, so it gets its own pooled client
+        http_client = mock_build_client.return_value
+        mock_create.assert_called_once_with(http_client)
+        mock_thread.assert_called_once()
+        kwargs = mock_thread.call_args.kwargs
+        assert kwargs["target"] is agent_main._run_scheduler
+        assert kwargs["args"] == (mock_agent, http_client, WATCHLIST["queries"])
+        assert kwargs["daemon"] is True
+        mock_thread.return_value.start.assert_called_once()
+        assert agent_main._scheduler_thread is mock_thread.return_value
+
+
+def test_run_scheduler_refreshes_until_stopped():
+    """Test that the scheduler loop pre-computes, stops on request and closes its client."""
+    mock_agent = MagicMock()
+    http_client = MagicMock()
+    http_client.aclose = AsyncMock()
+    queries = WATCHLIST["queries"]
+
+    async def precompute_then_stop(_agent, _queries):
+        agent_main._scheduler_stop.set()
+        agent_main._scheduler_wake.set()
+
+    with patch("tweet_analysis_agent.main.precompute_watchlist", side_effect=precompute_then_stop) as mock_precompute:
+        agent_main._scheduler_stop.clear()
+        try:
+            agent_main._run_scheduler(mock_agent, http_client, queries)
+        finally:
+            agent_main._scheduler_stop.clear()
+            agent_main._scheduler_wake.clear()
+
+    mock_precompute.assert_called_once_with(mock_agent, queries)
+    http_client.aclose.assert_awaited_once()
+
+
+def test_stop_scheduler_signals_and_joins_thread():
+    """Test that stopping the scheduler signals the loop and waits for the thread."""
+    mock_thread = MagicMock()
+
+    with patch("tweet_analysis_agent.main._scheduler_thread", mock_thread):
+        agent_main._scheduler_stop.clear()
+        try:
+            stop_scheduler()
+
+            assert agent_main._scheduler_stop.is_set()
+            mock_thread.join.assert_called_once_with(timeout=5)
+            assert agent_main._scheduler_thread is None
+        finally:
+            agent_main._scheduler_stop.clear()
@@ -0,0 +1,136 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Shared HTTP connection pools for the model provider and X/Twitter clients."""
+
+import contextlib
+from typing import Any
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_HTTP_CONFIG: dict[str, Any] = {
+    "max_connections_per_host": 20,
+    "keepalive_expiry_seconds": 30.0,
+    "http2": False,
+    "timeout_seconds": 120.0,
+}
+
+# Shared clients, created lazily from the active configuration
+_http_config: dict[str, Any] = dict(DEFAULT_HTTP_CONFIG)
+_llm_client: httpx.AsyncClient | None = None
+_x_session: requests.Session | None = None
+_llm_stats = {"requests": 0, "connections_opened": 0, "tls_handshakes": 0}
+
+
+def configure_http_clients(config: dict | None = None) -> None:
+    """Set the pool configuration used when the shared clients are created."""
+    global _http_config
+    _http_config = {**DEFAULT_HTTP_CONFIG, **(config or {})}
+
+
+async def _trace(event_name: str, info: dict) -> None:
+    """Count new connections and TLS handshakes reported by httpcore."""
+    if event_name == "connection.connect_tcp.complete":
+        _llm_stats["connections_opened"] += 1
+    elif event_name == "connection.start_tls.complete":
+        _llm_stats["tls_handshakes"] += 1
+
+
+async def _on_request(request: httpx.Request) -> None:
+    """Attach the connection tracer to every outgoing LLM request."""
+    _llm_stats["requests"] += 1
+    request.extensions["trace"] = _trace
+
+
+def build_llm_http_client(config: dict | None = None) -> httpx.AsyncClient:
+    """Create a keep-alive async client for LLM provider calls, overriding the active configuration."""
+    config = {**_http_config, **(config or {})}
+    # httpx has no per-host limit; this client only talks to the one LLM provider host,
+    # so the per-host cap is applied to the whole pool
+    limits = httpx.Limits(
+        max_connections=config["max_connections_per_host"],
+        max_keepalive_connections=config["max_connections_per_host"],
+        keepalive_expiry=config["keepalive_expiry_seconds"],
+    )
+    return httpx.AsyncClient(
+        http2=bool(config["http2"]),
+        limits=limits,
+        timeout=config["timeout_seconds"],
+        event_hooks={"request": [_on_request]},
+    )
+
+
+def x_adapter_options(config: dict | None = None) -> dict[str, Any]:
+    """Return HTTPAdapter settings that cap connections per X/Twitter host, overriding the active configuration."""
+    config = {**_http_config, **(config or {})}
+    # Block when a host's pool is full instead of opening connections that are then discarded
+    return {"pool_maxsize": config["max_connections_per_host"], "pool_block": True}
+
+
+def build_x_session(config: dict | None = None) -> requests.Session:
+    """Create a keep-alive session for the X/Twitter API client, overriding the active configuration."""
+    adapter = HTTPAdapter(**x_adapter_options(config))
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_llm_http_client() -> httpx.AsyncClient:
+    """Return the shared async client for LLM provider calls."""
+    global _llm_client
+    if _llm_client is None or _llm_client.is_closed:
+        _llm_client = build_llm_http_client(_http_config)
+    return _llm_client
+
+
+def get_x_session() -> requests.Session:
+    """Return the shared session for X/Twitter API calls."""
+    global _x_session
+    if _x_session is None:
+        _x_session = build_x_session(_http_config)
+    return _x_session
+
+
+def get_http_pool_stats() -> dict[str, dict[str, Any]]:
+    """Return pool utilization metrics for the shared LLM and X/Twitter clients."""
+    llm_stats: dict[str, Any] = dict(_llm_stats)
+    llm_stats["reused_connections"] = max(llm_stats["requests"] - llm_stats["connections_opened"], 0)
+
+    x_stats: dict[str, Any] = {"requests": 0, "connections_opened": 0, "hosts": 0}
+    if _x_session is not None:
+        # The same adapter is mounted for both schemes, so count each one once
+        for adapter in set(_x_session.adapters.values()):
+            if not isinstance(adapter, HTTPAdapter):
+                continue
+            pools = adapter.poolmanager.pools
+            # urllib3's pool container does not support direct iteration
+            for key in pools.keys():  # noqa: SIM118
+                pool = pools[key]
+                x_stats["hosts"] += 1
+                x_stats["requests"] += pool.num_requests
+                x_stats["connections_opened"] += pool.num_connections
+    x_stats["reused_connections"] = max(x_stats["requests"] - x_stats["connections_opened"], 0)
+
+    return {"llm": llm_stats, "x": x_stats}
+
+
+async def close_http_clients() -> None:
+    """Close the shared clients and release their pooled connections."""
+    global _llm_client, _x_session
+    if _llm_client is not None:
+        # Pooled connections belong to the server's event loop, which may already be closed
+        with contextlib.suppress(RuntimeError):
+            await _llm_client.aclose()
+        _llm_client = None
+    if _x_session is not None:
+        _x_session.close()
+        _x_session = None
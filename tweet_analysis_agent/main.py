@@ -11,14 +11,19 @@
 
 import argparse
 import asyncio
+import copy
 import json
 import os
 import sys
+import threading
+import time
 import traceback
+from datetime import UTC, datetime
 from pathlib import Path
 from textwrap import dedent
 from typing import Any
 
+import httpx
 from agno.agent import Agent
 from agno.models.openai import OpenAIChat
 from agno.models.openrouter import OpenRouter
@@ -26,6 +31,15 @@ from agno.tools.x import XTools
 from bindu.penguin.bindufy import bindufy
 from dotenv import load_dotenv
 
+from tweet_analysis_agent.http_clients import (
+    build_llm_http_client,
+    close_http_clients,
+    configure_http_clients,
+    get_http_pool_stats,
+    get_llm_http_client,
+    get_x_session,
+)
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -34,6 +48,23 @@ agent: Agent | None = None
 _initialized = False
 _init_lock = asyncio.Lock()
 
+# In-flight agent runs keyed by normalized query (single-flight coalescing)
+_inflight_runs: dict[str, asyncio.Task] = {}
+_coalesced_requests = 0
+
+# Reports pre-built by the watch-list scheduler, keyed by normalized query
+_precomputed_reports: dict[str, dict[str, Any]] = {}
+_watchlist_interval_seconds = 900.0
+_watchlist_max_age_seconds = 3600.0
+_scheduler_stop = threading.Event()
+_scheduler_wake = threading.Event()
+# System prompts bindu puts in front of every request, reused so watched reports match its format
+_watchlist_system_messages: list[dict[str, str]] = []
+_scheduler_thread: threading.Thread | None = None
+
+# Config sections handled by this agent rather than by bindu
+_LOCAL_CONFIG_KEYS = ("watchlist", "http")
+
 
 def load_config() -> dict:
     """Load agent configuration from project root."""
@@ -81,10 +112,8 @@ def load_config() -> dict:
     }
 
 
-async def initialize_agent() -> None:
-    """Initialize the tweet analysis agent with proper model and tools."""
-    global agent
-
+def create_agent(http_client: httpx.AsyncClient) -> Agent:
+    """Create the tweet analysis agent, sending LLM calls through the given pooled client."""
     # Get API keys from environment
     openai_api_key = os.getenv("OPENAI_API_KEY")
     openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
@@ -99,7 +128,7 @@ async def initialize_agent() -> None:
 
     # Model selection logic (supports both OpenAI and OpenRouter)
     if openai_api_key:
-        model = OpenAIChat(id="gpt-4o", api_key=openai_api_key)
+        model = OpenAIChat(id="gpt-4o", api_key=openai_api_key, http_client=http_client)
         print("✅ Using OpenAI GPT-4o")
     elif openrouter_api_key:
         model = OpenRouter(
@@ -107,6 +136,7 @@ async def initialize_agent() -> None:
             api_key=openrouter_api_key,
             cache_response=True,
             supports_native_structured_outputs=True,
+            http_client=http_client,
         )
         print(f"✅ Using OpenRouter model: {model_name}")
     else:
@@ -136,9 +166,11 @@ async def initialize_agent() -> None:
         include_post_metrics=True,
         wait_on_rate_limit=True,
     )
+    # Reuse pooled connections instead of tweepy's per-client session
+    x_tools.client.session = get_x_session()
 
     # Create the tweet analysis agent
-    agent = Agent(
+    return Agent(
         name="Social Media Analyst",
         model=model,
         tools=[x_tools],
@@ -239,6 +271,14 @@ async def initialize_agent() -> None:
         add_datetime_to_context=True,
         markdown=True,
     )
+
+
+async def initialize_agent() -> None:
+    """Initialize the tweet analysis agent with proper model and tools."""
+    global agent
+
+    # Shared keep-alive pool for all LLM provider calls
+    agent = create_agent(get_llm_http_client())
     print("✅ Tweet Analysis Agent initialized")
 
 
@@ -254,6 +294,169 @@ async def run_agent(messages: list[dict[str, str]]) -> Any:
     return response
 
 
+def normalize_query(messages: list[dict[str, str]]) -> str:
+    """Build a coalescing key from messages, ignoring case and whitespace differences."""
+    normalized = [
+        {
+            "role": str(message.get("role", "")).strip().lower(),
+            "content": " ".join(str(message.get("content", "")).split()).lower(),
+        }
+        for message in messages
+    ]
+    return json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+
+
+def get_coalesced_request_count() -> int:
+    """Return how many requests joined an already in-flight analysis."""
+    return _coalesced_requests
+
+
+async def run_agent_coalesced(messages: list[dict[str, str]]) -> Any:
+    """Run the agent, joining an in-flight run when an identical query is already being processed."""
+    global _coalesced_requests
+
+    key = normalize_query(messages)
+    task = _inflight_runs.get(key)
+    if task is not None:
+        _coalesced_requests += 1
+        print(f"🔁 Joining in-flight analysis ({_coalesced_requests} coalesced requests so far)")
+    else:
+        task = asyncio.ensure_future(run_agent(messages))
+        _inflight_runs[key] = task
+
+        def _release(done: asyncio.Task) -> None:
+            if _inflight_runs.get(key) is done:
+                del _inflight_runs[key]
+            # Mark the outcome as retrieved in case every waiting caller was cancelled
+            if not done.cancelled():
+                done.exception()
+
+        task.add_done_callback(_release)
+
+    # Shield so that one cancelled caller does not cancel the run for everyone else
+    return await asyncio.shield(task)
+
+
+def watchlist_key(messages: list[dict[str, str]]) -> str:
+    """Build the warm-report key from the system prompts and the last user message, ignoring history."""
+    system_messages = [message for message in messages if message.get("role") == "system"]
+    last_user = next((message for message in reversed(messages) if message.get("role") == "user"), None)
+    return normalize_query(system_messages + ([last_user] if last_user else []))
+
+
+def remember_system_messages(messages: list[dict[str, str]]) -> None:
+    """Record the system prompts of an incoming request, waking the scheduler to rebuild reports when they change."""
+    global _watchlist_system_messages
+
+    system_messages = [
+        {"role": "system", "content": str(message.get("content", ""))}
+        for message in messages
+        if message.get("role") == "system"
+    ]
+    if system_messages != _watchlist_system_messages:
+        _watchlist_system_messages = system_messages
+        _scheduler_wake.set()
+
+
+def get_precomputed_report(messages: list[dict[str, str]]) -> Any | None:
+    """Return a warm pre-built report for the query with staleness details, if one is fresh enough."""
+    entry = _precomputed_reports.get(watchlist_key(messages))
+    if entry is None:
+        return None
+
+    age_seconds = time.time() - entry["generated_at"]
+    if age_seconds > _watchlist_max_age_seconds:
+        return None
+
+    staleness = {
+        "precomputed": True,
+        "generated_at": datetime.fromtimestamp(entry["generated_at"], tz=UTC).isoformat(),
+        "age_seconds": round(age_seconds, 1),
+        "refresh_interval_seconds": _watchlist_interval_seconds,
+        "stale": age_seconds > _watchlist_interval_seconds,
+    }
+    response = copy.copy(entry["response"])
+    response.metadata = {**(getattr(entry["response"], "metadata", None) or {}), **staleness}
+    # bindu only forwards the content of a run, so the staleness details travel with it
+    if isinstance(response.content, str):
+        response.content = f"{response.content}\n\n---\n⏱️ Pre-computed report: {json.dumps(staleness)}"
+    return response
+
+
+async def precompute_watchlist(scheduler_agent: Agent, queries: list[dict[str, str]]) -> None:
+    """Fetch tweets and build reports for every watched query, storing them for on-demand requests."""
+    for entry in queries:
+        # Same shape as the handler receives, so the report matches what an on-demand run would return
+        messages = [*_watchlist_system_messages, {"role": "user", "content": entry["query"]}]
+        label = entry.get("brand", entry["query"])
+        started = time.time()
+        try:
+            response = await scheduler_agent.arun(messages)
+        except Exception as e:
+            print(f"⚠️  Pre-computation failed for {label}: {type(e).__name__}: {e}")
+            continue
+        _precomputed_reports[watchlist_key(messages)] = {"response": response, "generated_at": time.time()}
+        print(f"🗓️  Pre-computed report for {label} in {time.time() - started:.1f}s")
+
+
+async def _scheduler_loop(
+    scheduler_agent: Agent, http_client: httpx.AsyncClient, queries: list[dict[str, str]]
+) -> None:
+    """Refresh watched reports on a fixed cadence until the scheduler is stopped."""
+    try:
+        while not _scheduler_stop.is_set():
+            await precompute_watchlist(scheduler_agent, queries)
+            # Woken early when stopping or when bindu's system prompts change
+            await asyncio.to_thread(_scheduler_wake.wait, _watchlist_interval_seconds)
+            _scheduler_wake.clear()
+    finally:
+        await http_client.aclose()
+
+
+def _run_scheduler(scheduler_agent: Agent, http_client: httpx.AsyncClient, queries: list[dict[str, str]]) -> None:
+    """Run the scheduler on its own event loop, separate from the server's."""
+    asyncio.run(_scheduler_loop(scheduler_agent, http_client, queries))
+
+
+def start_scheduler(watchlist: dict) -> None:
+    """Start the background scheduler that keeps watched brand reports warm."""
+    global _scheduler_thread, _watchlist_interval_seconds, _watchlist_max_age_seconds
+
+    queries = watchlist.get("queries", [])
+    if not watchlist.get("enabled", False) or not queries:
+        return
+
+    _watchlist_interval_seconds = float(watchlist.get("interval_seconds", _watchlist_interval_seconds))
+    _watchlist_max_age_seconds = float(watchlist.get("max_age_seconds", _watchlist_max_age_seconds))
+
+    # Async connections are bound to an event loop, so the scheduler gets its own agent and pool
+    http_client = build_llm_http_client()
+    try:
+        scheduler_agent = create_agent(http_client)
+    except ValueError as e:
+        print(f"⚠️  Watch-list scheduler disabled: {e}")
+        return
+
+    _scheduler_stop.clear()
+    _scheduler_wake.clear()
+    _scheduler_thread = threading.Thread(
+        target=_run_scheduler, args=(scheduler_agent, http_client, queries), name="watchlist-scheduler", daemon=True
+    )
+    _scheduler_thread.start()
+    print(f"🗓️  Watch-list scheduler started: {len(queries)} queries every {_watchlist_interval_seconds:.0f}s")
+
+
+def stop_scheduler() -> None:
+    """Stop the background watch-list scheduler."""
+    global _scheduler_thread
+
+    _scheduler_stop.set()
+    _scheduler_wake.set()
+    if _scheduler_thread is not None:
+        _scheduler_thread.join(timeout=5)
+        _scheduler_thread = None
+
+
 async def handler(messages: list[dict[str, str]]) -> Any:
     """Handle incoming agent messages with lazy initialization."""
     global _initialized
@@ -265,14 +468,23 @@ async def handler(messages: list[dict[str, str]]) -> Any:
             await initialize_agent()
             _initialized = True
 
-    # Run the async agent
-    result = await run_agent(messages)
+    # Serve warm reports for watched queries
+    remember_system_messages(messages)
+    precomputed = get_precomputed_report(messages)
+    if precomputed is not None:
+        return precomputed
+
+    # Run the async agent, coalescing concurrent identical queries
+    result = await run_agent_coalesced(messages)
     return result
 
 
 async def cleanup() -> None:
     """Clean up any resources."""
     print("🧹 Cleaning up Tweet Analysis Agent resources...")
+    stop_scheduler()
+    print(f"📈 HTTP pool stats: {json.dumps(get_http_pool_stats())}")
+    await close_http_clients()
 
 
 def create_argument_parser() -> argparse.ArgumentParser:
@@ -360,7 +572,10 @@ def run_agent_server(config: dict) -> None:
         # Bindufy and start the agent server
         print("🚀 Starting Bindu Tweet Analysis Agent server...")
         print(f"🌐 Server will run on: {config.get('deployment', {}).get('url', 'http://127.0.0.1:3774')}")
-        bindufy(config, handler)
+        configure_http_clients(config.get("http", {}))
+        start_scheduler(config.get("watchlist", {}))
+        # Agent-level sections are handled here, bindu only receives its own settings
+        bindufy({key: value for key, value in config.items() if key not in _LOCAL_CONFIG_KEYS}, handler)
     except KeyboardInterrupt:
         print("\n🛑 Tweet Analysis Agent stopped")
     except Exception as e: